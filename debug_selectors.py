@@ -1,118 +1,303 @@
 #!/usr/bin/env python3
 """Debug script to capture LinkedIn's current HTML structure"""
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from pathlib import Path
+import argparse
+import asyncio
+import functools
+import hashlib
+import heapq
 import json
-import time
+import mmap
+import os
+import re
+
+import orjson
+
+HERE = Path(__file__).resolve().parent
+SESSIONS_DIR = HERE / 'sessions'
+COOKIE_FILE = SESSIONS_DIR / 'linkedin_cookies.json'
+KEY_FILE = SESSIONS_DIR / 'encryption.key'
+SELECTOR_CACHE_FILE = SESSIONS_DIR / 'selector_cache.json'
+DUMP_FILE = HERE / 'linkedin_feed_dump.html'
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# Trim Chromium features a one-shot debug dump never uses
+LAUNCH_ARGS = [
+    '--disable-extensions',
+    '--disable-sync',
+    '--no-first-run',
+    '--disable-background-networking',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--disable-renderer-backgrounding',
+]
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+CLASS_RE = re.compile(r'class="([^"]+)"')
+CLASS_KEYWORDS = ('feed', 'update', 'post', 'actor')
 
 def setup_sessions_directory():
-    sessions_dir = Path(__file__).parent / 'sessions'
-    sessions_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
-    return sessions_dir
+    SESSIONS_DIR.mkdir(mode=0o777, parents=True, exist_ok=True)
+    return SESSIONS_DIR
 
-def load_cookies(context):
-    """Load cookies from encrypted file"""
+@functools.lru_cache(maxsize=1)
+def _fernet(key):
     from cryptography.fernet import Fernet
-    sessions_dir = Path(__file__).parent / 'sessions'
-    cookie_file = sessions_dir / 'linkedin_cookies.json'
-    key_file = sessions_dir / 'encryption.key'
-    
-    if not cookie_file.exists() or not key_file.exists():
-        return False
+    return Fernet(key)
+
+def read_cookie_data():
+    """Decrypt the saved cookie file, or return None if it is missing or unreadable"""
+    if not COOKIE_FILE.exists() or not KEY_FILE.exists():
+        return None
     
     try:
-        with open(key_file, 'rb') as f:
-            key = f.read()
-        with open(cookie_file, 'rb') as f:
-            encrypted = f.read()
-        
-        fernet = Fernet(key)
-        cookie_data = json.loads(fernet.decrypt(encrypted))
-        context.add_cookies(cookie_data["cookies"])
-        print("Cookies loaded successfully")
-        return True
+        key = KEY_FILE.read_bytes()
+        with open(COOKIE_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return orjson.loads(_fernet(key).decrypt(bytes(mm)))
     except Exception as e:
         print(f"Failed to load cookies: {e}")
+        return None
+
+async def load_cookies(context):
+    """Load cookies from encrypted file"""
+    cookie_data = read_cookie_data()
+    if cookie_data is None:
         return False
+    await context.add_cookies(cookie_data["cookies"])
+    print("Cookies loaded successfully")
+    return True
+
+def fetch_feed_html(cookie_data):
+    """Fetch the server-rendered feed over plain HTTP; None if LinkedIn redirects to login or the request fails"""
+    import httpx
+    cookies = {c['name']: c['value'] for c in cookie_data['cookies']}
+    try:
+        with httpx.Client(cookies=cookies, headers={'user-agent': USER_AGENT},
+                          follow_redirects=True, timeout=15) as client:
+            response = client.get('https://www.linkedin.com/feed/')
+    except httpx.HTTPError as e:
+        print(f"HTTP fetch failed: {e}")
+        return None
+    if response.status_code != 200 or 'login' in str(response.url):
+        return None
+    return response.text
+
+def harvest_classes(html, limit=50):
+    """First `limit` feed-related class names under <main>, found with one regex sweep over the raw HTML"""
+    start = html.find('<main')
+    start = start if start >= 0 else 0
+    end = html.find('</main>', start)
+    end = end if end >= 0 else len(html)
+    classes = set()
+    # Feed items repeat the same class attribute thousands of times; only
+    # tokenize each distinct attribute value once
+    seen_attrs = set()
+    for m in CLASS_RE.finditer(html, start, end):
+        attr = m.group(1)
+        if attr in seen_attrs:
+            continue
+        seen_attrs.add(attr)
+        classes.update(c for c in attr.split() if any(k in c for k in CLASS_KEYWORDS))
+    # Only the first few are printed, so avoid sorting the whole set
+    return heapq.nsmallest(limit, classes)
+
+def load_selector_cache():
+    """Last full-scan results: {selector: {n, sha1, html}}"""
+    if not SELECTOR_CACHE_FILE.exists():
+        return {}
+    try:
+        with open(SELECTOR_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Failed to load selector cache: {e}")
+        return {}
+
+def save_selector_cache(results):
+    cache = {
+        r['sel']: {'n': r['n'], 'sha1': preview_hash(r['html']), 'html': r['html']}
+        for r in results if r.get('n')
+    }
+    setup_sessions_directory()
+    with open(SELECTOR_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+def preview_hash(html):
+    return hashlib.sha1(html.encode('utf-8')).hexdigest() if html else None
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 800},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
+def print_selector_results(results):
+    for result in results:
+        selector = result['sel']
+        if 'err' in result:
+            print(f"✗ Selector '{selector}' failed: {result['err']}")
+        elif result['n']:
+            print(f"\n✓ Found {result['n']} elements with: {selector}")
+            # Print first element's outer HTML (truncated)
+            print(f"  First element preview: {result['html']}...")
+
+def save_dump(html):
+    # Encode once and hand the bytes over in a single write, bypassing the text layer
+    DUMP_FILE.write_bytes(html.encode('utf-8'))
+    print(f"Full HTML saved to: {DUMP_FILE}")
+
+def print_classes(classes):
+    print("\n=== Unique class names in main content ===")
+    for cls in classes:
+        print(f"  .{cls}")
+
+# (selector, is_generic), ordered most-specific first. Generic fallbacks
+# (wildcard attribute and bare tag paths) are slow to match and only probed
+# when no specific selector hits.
+SELECTORS = (
+    ('.occludable-update', False),
+    ('.feed-shared-update-v2', False),
+    ('[data-urn]', False),
+    ('[data-id]', False),
+    ('.update-components-actor', False),
+    ('.feed-shared-actor', False),
+    ('div[class*="feed"]', True),
+    ('div[class*="update"]', True),
+    ('article', True),
+    ('main > div > div', True),
+)
+PRIMARY_SELECTORS = [sel for sel, is_generic in SELECTORS if not is_generic]
+FALLBACK_SELECTORS = [sel for sel, is_generic in SELECTORS if is_generic]
+SELECTOR_GROUPS = [PRIMARY_SELECTORS, FALLBACK_SELECTORS]
+
+async def scan_selectors(page, selector_groups):
+    """Return (results, cached_selector); cached_selector is set when the cache was reused"""
+    # If the first cached selector still matches with the same count and
+    # preview, the feed structure is unchanged and the full scan can be skipped
+    cache = load_selector_cache()
+    top = next(iter(cache), None)
+    probe = await page.evaluate('''(s) => {
+        const els = document.querySelectorAll(s);
+        return {n: els.length, html: els[0] ? els[0].outerHTML.slice(0, 300) : null};
+    }''', top) if top else None
+    
+    if probe and probe['n'] == cache[top]['n'] and preview_hash(probe['html']) == cache[top]['sha1']:
+        return [{'sel': sel, **entry} for sel, entry in cache.items()], top
+    
+    # Probe every selector in one round-trip and one DOM walk per group:
+    # validate each selector once, then bucket every element against all
+    # matchers. Later groups are only walked if no earlier selector matched.
+    results = await page.evaluate('''(groups) => {
+        const results = [];
+        for (const sels of groups) {
+            if (results.some(r => r.n)) break;
+            const batch = sels.map(s => {
+                try {
+                    document.documentElement.matches(s);
+                    return {sel: s, n: 0, html: null};
+                } catch (e) {
+                    return {sel: s, err: String(e)};
+                }
+            });
+            const matchers = batch.filter(r => !('err' in r));
+            const walker = document.createTreeWalker(document, NodeFilter.SHOW_ELEMENT);
+            let el;
+            while ((el = walker.nextNode())) {
+                for (const m of matchers) {
+                    if (el.matches(m.sel)) {
+                        if (m.n++ === 0) m.html = el.outerHTML.slice(0, 300);
+                    }
+                }
+            }
+            results.push(...batch);
+        }
+        return results;
+    }''', selector_groups)
+    save_selector_cache(results)
+    return results, None
+
+async def main(dump_only=False):
+    # LINKEDIN_DEBUG_HTTP=1: fetch the server-rendered feed with httpx and skip the
+    # browser. Posts are rendered client-side, so only the page skeleton and its
+    # class names are available this way; selector probing still needs Chromium.
+    cookie_data = read_cookie_data() if os.getenv('LINKEDIN_DEBUG_HTTP') else None
+    if cookie_data:
+        print("Fetching LinkedIn feed over HTTP...")
+        html = fetch_feed_html(cookie_data)
+        if html is not None:
+            save_dump(html)
+            if not dump_only:
+                print_classes(harvest_classes(html))
+            print("\n=== Done! Check linkedin_feed_dump.html for full structure ===")
+            return
+        print("HTTP fetch did not return the feed, falling back to browser...")
+    
+    # LINKEDIN_DEBUG_CDP=http://localhost:9222: attach to an already running Chromium
+    # instead of cold-starting one per run. Start it once with:
+    #   chromium --remote-debugging-port=9222 --user-data-dir=/tmp/linkedin_debug_profile
+    cdp_url = os.getenv('LINKEDIN_DEBUG_CDP')
+    
+    async with async_playwright() as p:
+        if cdp_url:
+            browser = await p.chromium.connect_over_cdp(cdp_url)
+            context = browser.contexts[0] if browser.contexts else await browser.new_context(user_agent=USER_AGENT)
+        else:
+            browser = await p.chromium.launch(headless=False, args=LAUNCH_ARGS)
+            context = await browser.new_context(
+                viewport={'width': 1280, 'height': 800},
+                user_agent=USER_AGENT,
+                service_workers='block'
+            )
         
-        load_cookies(context)
-        page = context.new_page()
+        await load_cookies(context)
+        page = await context.new_page()
+        # The selector scan only needs the DOM; skip image, media and font bytes
+        await page.route('**/*', lambda route: route.abort()
+                         if route.request.resource_type in BLOCKED_RESOURCE_TYPES
+                         else route.continue_())
         
         print("Navigating to LinkedIn feed...")
-        page.goto('https://www.linkedin.com/feed/', wait_until='networkidle', timeout=30000)
+        await page.goto('https://www.linkedin.com/feed/', wait_until='domcontentloaded', timeout=15000)
         
         if 'login' in page.url:
             print("Not logged in! Please login manually...")
-            page.wait_for_url('**/feed/**', timeout=120000)
+            await page.wait_for_url('**/feed/**', timeout=120000)
         
         print("Waiting for feed to load...")
-        time.sleep(5)
-        
-        # Save the full HTML for analysis
-        html = page.content()
-        output_file = Path(__file__).parent / 'linkedin_feed_dump.html'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        print(f"Full HTML saved to: {output_file}")
-        
-        # Try to find post-like elements and print their structure
-        print("\n=== Searching for post containers ===")
-        
-        selectors_to_try = [
-            '.occludable-update',
-            '.feed-shared-update-v2',
-            '[data-urn]',
-            '[data-id]',
-            '.update-components-actor',
-            '.feed-shared-actor',
-            'div[class*="feed"]',
-            'div[class*="update"]',
-            'article',
-            'main > div > div',
-        ]
-        
-        for selector in selectors_to_try:
-            try:
-                elements = page.query_selector_all(selector)
-                if elements:
-                    print(f"\n✓ Found {len(elements)} elements with: {selector}")
-                    # Print first element's outer HTML (truncated)
-                    if elements:
-                        first_html = elements[0].evaluate('el => el.outerHTML')
-                        print(f"  First element preview: {first_html[:300]}...")
-            except Exception as e:
-                print(f"✗ Selector '{selector}' failed: {e}")
-        
-        # Also dump all class names found in main content area
-        print("\n=== Unique class names in main content ===")
-        classes = page.evaluate('''() => {
-            const main = document.querySelector('main') || document.body;
-            const allClasses = new Set();
-            main.querySelectorAll('*').forEach(el => {
-                el.classList.forEach(c => {
-                    if (c.includes('feed') || c.includes('update') || c.includes('post') || c.includes('actor')) {
-                        allClasses.add(c);
-                    }
-                });
-            });
-            return Array.from(allClasses).sort();
-        }''')
+        try:
+            await page.wait_for_selector('main [data-urn], .feed-shared-update-v2', state='attached', timeout=10000)
+        except PlaywrightTimeoutError:
+            print("Feed selector not found after 10s, dumping what is there")
         
-        for cls in classes[:50]:  # Print first 50
-            print(f"  .{cls}")
+        if dump_only:
+            save_dump(await page.content())
+        else:
+            # Serializing the page and scanning selectors are independent, so both
+            # requests go out over the CDP connection concurrently, and the dump is
+            # written to disk on a worker thread while the scan is still running
+            scan = asyncio.create_task(scan_selectors(page, SELECTOR_GROUPS))
+            html = await page.content()
+            
+            # Save the full HTML for analysis
+            dump = asyncio.create_task(asyncio.to_thread(save_dump, html))
+            results, cached = await scan
+            await dump
+            
+            # Try to find post-like elements and print their structure
+            print("\n=== Searching for post containers ===")
+            if cached:
+                print(f"Feed structure unchanged since last scan (matched {cached}), using cached results")
+            print_selector_results(results)
+            if not cached and len(results) == len(PRIMARY_SELECTORS):
+                print(f"\n(skipped {len(FALLBACK_SELECTORS)} generic fallback selectors, a specific one matched)")
+            
+            # Also dump all class names found in main content area
+            print_classes(harvest_classes(html))
         
         print("\n=== Done! Check linkedin_feed_dump.html for full structure ===")
         
-        browser.close()
+        if cdp_url:
+            # Leave the shared browser running for the next run
+            await page.close()
+        else:
+            await browser.close()
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument('--dump-only', action='store_true',
+                    help='only save linkedin_feed_dump.html, skip the selector scan and class harvest')
+    args = ap.parse_args()
+    asyncio.run(main(dump_only=args.dump_only))
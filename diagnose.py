@@ -236,11 +236,15 @@ def cmd_selectors():
         print(f"  {s}")
 
 
+# Module-level JS constants passed to evaluate() by name, e.g. _SEARCH_EXTRACT_JS = r'''...
+JS_CONSTANT_RE = re.compile(r"^_?[A-Z][A-Z0-9_]*_JS = r?('''|\"\"\")", re.MULTILINE)
+
+
 def cmd_validate():
-    """Syntax-check every page.evaluate() JS block using node."""
+    """Syntax-check every page.evaluate() JS block and *_JS constant using node."""
     source = MCP_FILE.read_text()
     # Find every evaluate( followed by a JS arrow/function literal.
-    # We look for the opening """ or ''' after evaluate( and scan for the matching close.
+    # We look for the opening """ or ''' (optionally r-prefixed) after evaluate( and scan for the matching close.
     blocks = []
     i = 0
     while i < len(source):
@@ -249,6 +253,8 @@ def cmd_validate():
         if pos == -1:
             break
         after = pos + len("evaluate(")
+        if source[after] == "r":
+            after += 1
         # Determine triple-quote delimiter
         chunk = source[after:after + 3]
         if chunk == '"""':
@@ -269,7 +275,16 @@ def cmd_validate():
         blocks.append((line_num, js))
         i = close_pos + 3
 
-    print(f"Found {len(blocks)} evaluate() block(s) in {MCP_FILE.name}\n")
+    # Extractors kept as module constants are passed to evaluate() by name
+    for m in JS_CONSTANT_RE.finditer(source):
+        js_start = m.end()
+        close_pos = source.find(m.group(1), js_start)
+        if close_pos == -1:
+            continue
+        blocks.append((source[:m.start()].count("\n") + 1, source[js_start:close_pos]))
+    blocks.sort()
+
+    print(f"Found {len(blocks)} JS block(s) in {MCP_FILE.name}\n")
     all_ok = True
     tmp = Path("/tmp/_li_validate.js")
     for line_num, js in blocks:
@@ -4,13 +4,12 @@ from fastmcp import FastMCP
 from fastmcp.server.auth import AccessToken, TokenVerifier
 from fastmcp.server.server import Middleware
 from mcp.types import TextContent
-from playwright.async_api import async_playwright
 import asyncio
 import os
 import json
-from typing import Literal, Optional
+import hashlib
+from typing import TYPE_CHECKING, Literal, Optional
 from dotenv import load_dotenv
-from cryptography.fernet import Fernet
 import time
 import logging
 import sys
@@ -21,8 +20,12 @@ import socket
 import urllib.request
 import urllib.parse
 import aiosqlite
+import orjson
 from aiohttp import web
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
 # Set up logging — file handler ensures logs persist regardless of how the process is started
 _log_fmt = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 _file_handler = logging.FileHandler('/tmp/linkedin-mcp.log')
@@ -72,6 +75,10 @@ async def lifespan(server):
     logger.info(f"Audit DB initialized at {AUDIT_DB_PATH}")
     await start_webhook_server()
     yield
+    # Let pending cookie saves finish before their browsers go away
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+    await close_shared_sessions()
     if _audit_db:
         await _audit_db.close()
         _audit_db = None
@@ -266,6 +273,20 @@ class AuditMiddleware(Middleware):
 mcp.add_middleware(AuditMiddleware())
 
 
+# Compiled once: the feed and post-search filters parse a date per post
+_DATE_TRAILER_RE = re.compile(r'[•·].*|edited.*')
+_SHORT_DATE_RE = re.compile(r'^(\d+)(h|d|w|mo|yr)$')
+_LONG_DATE_RE = re.compile(r'^(\d+)\s*(hour|day|week|month|year)s?\s*(?:ago)?$')
+# Days per unit; hours count as 0 days old
+_DATE_UNIT_DAYS = {
+    'h': 0, 'hour': 0,
+    'd': 1, 'day': 1,
+    'w': 7, 'week': 7,
+    'mo': 30, 'month': 30,
+    'yr': 365, 'year': 365,
+}
+
+
 def parse_linkedin_date(date_str: str) -> tuple[datetime, int]:
     """
     Parse LinkedIn relative date string into actual date and age in days.
@@ -279,70 +300,24 @@ def parse_linkedin_date(date_str: str) -> tuple[datetime, int]:
     if not date_str:
         return datetime.now(), 0
     
-    # Clean up the string - remove bullets, dots, 'Edited', extra spaces
-    date_str = date_str.lower().strip()
-    date_str = re.sub(r'[•·].*', '', date_str)  # Remove everything after bullet
-    date_str = re.sub(r'edited.*', '', date_str, flags=re.IGNORECASE)
-    date_str = date_str.strip()
+    # Clean up the string - remove everything after a bullet/dot and 'Edited'
+    date_str = _DATE_TRAILER_RE.sub('', date_str.lower().strip()).strip()
     
     now = datetime.now()
     
     # Handle "just now" or very recent
-    if 'just now' in date_str or 'now' in date_str:
+    if 'now' in date_str:
         return now, 0
     
-    # Pattern matching for LinkedIn formats
-    # Short format: 1h, 2d, 1w, 1mo, 1yr
-    short_match = re.match(r'^(\d+)(h|d|w|mo|yr)$', date_str)
-    if short_match:
-        value = int(short_match.group(1))
-        unit = short_match.group(2)
-        
-        if unit == 'h':
-            delta = timedelta(hours=value)
-            days = 0
-        elif unit == 'd':
-            delta = timedelta(days=value)
-            days = value
-        elif unit == 'w':
-            delta = timedelta(weeks=value)
-            days = value * 7
-        elif unit == 'mo':
-            delta = timedelta(days=value * 30)
-            days = value * 30
-        elif unit == 'yr':
-            delta = timedelta(days=value * 365)
-            days = value * 365
-        else:
-            return now, 0
-        
-        return now - delta, days
-    
-    # Long format: "5 hours ago", "3 days ago", "2 weeks ago"
-    long_match = re.match(r'^(\d+)\s*(hour|day|week|month|year)s?\s*(?:ago)?$', date_str)
-    if long_match:
-        value = int(long_match.group(1))
-        unit = long_match.group(2)
-        
-        if unit == 'hour':
-            delta = timedelta(hours=value)
-            days = 0
-        elif unit == 'day':
-            delta = timedelta(days=value)
-            days = value
-        elif unit == 'week':
-            delta = timedelta(weeks=value)
-            days = value * 7
-        elif unit == 'month':
-            delta = timedelta(days=value * 30)
-            days = value * 30
-        elif unit == 'year':
-            delta = timedelta(days=value * 365)
-            days = value * 365
-        else:
-            return now, 0
-        
-        return now - delta, days
+    # Short format (1h, 2d, 1w, 1mo, 1yr), then long format ("5 hours ago", "3 days ago")
+    match = _SHORT_DATE_RE.match(date_str) or _LONG_DATE_RE.match(date_str)
+    if match:
+        value = int(match.group(1))
+        unit = match.group(2)
+        if unit in ('h', 'hour'):
+            return now - timedelta(hours=value), 0
+        days = value * _DATE_UNIT_DAYS[unit]
+        return now - timedelta(days=days), days
     
     # If we can't parse, assume it's recent (today)
     return now, 0
@@ -368,10 +343,42 @@ def filter_posts_by_age(posts: list, max_age_days: int) -> list:
     return filtered
 
 
+# Feed post containers (Dec 2025 selectors)
+FEED_POST_SELECTOR = 'div.feed-shared-update-v2[data-urn^="urn:li:activity"]'
+
+SESSIONS_DIR = Path(__file__).parent / 'sessions'
+KEY_FILE = SESSIONS_DIR / 'encryption.key'
+_sessions_dir_ready = False
+
+
 def setup_sessions_directory():
-    sessions_dir = Path(__file__).parent / 'sessions'
-    sessions_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
-    return sessions_dir
+    global _sessions_dir_ready
+    if not _sessions_dir_ready:
+        SESSIONS_DIR.mkdir(mode=0o777, parents=True, exist_ok=True)
+        _sessions_dir_ready = True
+    return SESSIONS_DIR
+
+
+# Cookie-encryption Fernet, built once from sessions/encryption.key.
+# cryptography is imported on first use so tool listing doesn't pay for it.
+_fernet: Fernet | None = None
+
+
+def _get_fernet() -> Fernet:
+    """Return the cookie Fernet, reading (or generating) the key file on first use."""
+    global _fernet
+    if _fernet is None:
+        from cryptography.fernet import Fernet
+        setup_sessions_directory()
+        if KEY_FILE.exists():
+            with open(KEY_FILE, 'rb') as f:
+                key = f.read()
+        else:
+            key = Fernet.generate_key()
+            with open(KEY_FILE, 'wb') as f:
+                f.write(key)
+        _fernet = Fernet(key)
+    return _fernet
 
 
 # Account configurations
@@ -400,8 +407,7 @@ def require_session(account: str = None) -> list | None:
     """Check if a valid cookie file exists. If not, fire Telegram and return an error TextContent list.
     Call at the top of every tool handler before launching any browser."""
     acc = account or CURRENT_ACCOUNT
-    sessions_dir = Path(__file__).parent / 'sessions'
-    cookie_file = sessions_dir / get_cookie_filename(acc)
+    cookie_file = SESSIONS_DIR / get_cookie_filename(acc)
     if not cookie_file.exists():
         notify_login_required(acc)
         return [TextContent(type="text", text=json.dumps({
@@ -411,6 +417,14 @@ def require_session(account: str = None) -> list | None:
     return None
 
 
+# Per-account (sha1 of cookie list, save time) of the last cookie file written
+_last_cookie_save: dict[str, tuple[str, float]] = {}
+# Unchanged cookies are still rewritten this often so load_cookies' 24h expiry never trips mid-use
+COOKIE_REFRESH_SECONDS = 3600
+# Serializes the check-and-write so overlapping background saves can't interleave
+_cookie_save_lock = asyncio.Lock()
+
+
 async def save_cookies(page, account: str = None, cdp_port: int = None):
     """Save cookies to encrypted file for specific account.
     
@@ -432,7 +446,8 @@ async def save_cookies(page, account: str = None, cdp_port: int = None):
         try:
             import websockets as _ws
             async def _cdp_cookies():
-                tabs = json.loads(_req.urlopen(f"http://localhost:{cdp_port}/json").read())
+                tabs = json.loads(await asyncio.to_thread(
+                    lambda: _req.urlopen(f"http://localhost:{cdp_port}/json").read()))
                 # Find the LinkedIn tab, not just tabs[0]
                 li_tab = next((t for t in tabs if 'linkedin.com' in t.get('url', '')), tabs[0])
                 ws_url = li_tab['webSocketDebuggerUrl']
@@ -449,51 +464,61 @@ async def save_cookies(page, account: str = None, cdp_port: int = None):
     if cookies is None:
         cookies = await page.context.cookies()
         logger.info(f"Captured {len(cookies)} cookies via Playwright for {acc}")
-    cookie_data = {"timestamp": int(time.time()), "cookies": cookies, "account": acc}
 
-    sessions_dir = setup_sessions_directory()
+    cookie_file = setup_sessions_directory() / get_cookie_filename(acc)
+    digest = hashlib.sha1(json.dumps(cookies, sort_keys=True).encode()).hexdigest()
+    async with _cookie_save_lock:
+        now = time.time()
+        last = _last_cookie_save.get(acc)
+        if last and last[0] == digest and now - last[1] < COOKIE_REFRESH_SECONDS and cookie_file.exists():
+            logger.debug(f"Cookies unchanged for {acc}, skipping save")
+            return
+        cookie_data = {"timestamp": int(now), "cookies": cookies, "account": acc}
+
+        # File I/O (and the first key read) runs off the event loop so concurrent tool calls keep going
+        fernet = await asyncio.to_thread(_get_fernet)
+        encrypted = fernet.encrypt(json.dumps(cookie_data).encode())
+
+        await asyncio.to_thread(cookie_file.write_bytes, encrypted)
+        _last_cookie_save[acc] = (digest, now)
+    logger.info(f"Cookies saved for account: {acc}")
 
-    key_file = sessions_dir / 'encryption.key'
-    if key_file.exists():
-        with open(key_file, 'rb') as f:
-            key = f.read()
-    else:
-        key = Fernet.generate_key()
-        with open(key_file, 'wb') as f:
-            f.write(key)
 
-    fernet = Fernet(key)
-    encrypted = fernet.encrypt(json.dumps(cookie_data).encode())
+# Strong references to fire-and-forget tasks; the event loop only keeps weak ones
+_background_tasks: set[asyncio.Task] = set()
 
-    cookie_file = sessions_dir / get_cookie_filename(acc)
-    with open(cookie_file, 'wb') as f:
-        f.write(encrypted)
-    logger.info(f"Cookies saved for account: {acc}")
+
+def _on_background_task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Background cookie save failed: {task.exception()}")
+
+
+def save_cookies_later(page, account: str = None):
+    """Schedule save_cookies without holding up the tool response.
+    Login flows keep awaiting save_cookies since they close the browser right after."""
+    task = asyncio.create_task(save_cookies(page, account))
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
 
 
 async def load_cookies(context, account: str = None):
     """Load cookies from encrypted file for specific account"""
     acc = account or CURRENT_ACCOUNT
-    sessions_dir = Path(__file__).parent / 'sessions'
-    cookie_file = sessions_dir / get_cookie_filename(acc)
-    key_file = sessions_dir / 'encryption.key'
+    cookie_file = SESSIONS_DIR / get_cookie_filename(acc)
 
-    if not cookie_file.exists() or not key_file.exists():
+    if not cookie_file.exists() or not KEY_FILE.exists():
         logger.warning(f"No cookies found for account: {acc}")
         return False
 
     try:
-        with open(key_file, 'rb') as f:
-            key = f.read()
-        with open(cookie_file, 'rb') as f:
-            encrypted = f.read()
-
-        fernet = Fernet(key)
+        fernet = await asyncio.to_thread(_get_fernet)
+        encrypted = await asyncio.to_thread(cookie_file.read_bytes)
         cookie_data = json.loads(fernet.decrypt(encrypted))
 
         # Check expiration (24 hours)
         if time.time() - cookie_data["timestamp"] > 86400:
-            cookie_file.unlink()
+            await asyncio.to_thread(cookie_file.unlink)
             return False
 
         await context.add_cookies(cookie_data["cookies"])
@@ -504,27 +529,43 @@ async def load_cookies(context, account: str = None):
         return False
 
 
+# Scrapers never read these; aborting them cuts most of a LinkedIn page's weight.
+# Stylesheets stay: innerText depends on CSS visibility.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+BLOCKED_URL_MARKERS = ('px.ads.linkedin.com', '/li/track', '/sensorCollect')
+
+
+async def _block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(m in request.url for m in BLOCKED_URL_MARKERS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 class BrowserSession:
+    # Playwright keeps every Request/Response of a context alive until the
+    # context closes, so long-lived sessions swap in a fresh one periodically
+    PAGES_PER_CONTEXT = 20
+
     def __init__(self, headless=True, account: str = None):
         self.headless = headless
         self.account = account or CURRENT_ACCOUNT
         self.playwright = None
         self.browser = None
         self.context = None
+        self._page_count = 0
+        self._context_lock = asyncio.Lock()
 
     async def __aenter__(self):
+        from playwright.async_api import async_playwright
         setup_sessions_directory()
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
             args=['--disable-dev-shm-usage', '--no-sandbox', '--disable-blink-features=AutomationControlled']
         )
-        self.context = await self.browser.new_context(
-            viewport={'width': 1280, 'height': 800},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        # Store account in context for save_cookies to access
-        self.context._account = self.account
+        self.context = await self._new_context()
         await load_cookies(self.context, self.account)
         return self
 
@@ -534,13 +575,107 @@ class BrowserSession:
         if self.playwright:
             await self.playwright.stop()
 
+    async def _new_context(self, storage_state=None):
+        context = await self.browser.new_context(
+            viewport={'width': 1280, 'height': 800},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            storage_state=storage_state,
+        )
+        # Store account in context for save_cookies to access
+        context._account = self.account
+        # Routed once per context; unrouted on recycle so handlers don't pile up
+        await context.route('**/*', _block_heavy_resources)
+        return context
+
+    async def _recycle_context(self):
+        """Replace the context with a fresh one, carrying over cookies and storage."""
+        state = await self.context.storage_state()
+        await self.context.unroute('**/*', _block_heavy_resources)
+        await self.context.close()
+        self.context = await self._new_context(storage_state=state)
+        self._page_count = 0
+        logger.info(f"Recycled browser context for {self.account}")
+
     async def new_page(self, url=None):
-        page = await self.context.new_page()
+        async with self._context_lock:
+            # Only recycle when idle so concurrent tool calls keep their pages
+            if self._page_count >= self.PAGES_PER_CONTEXT and not self.context.pages:
+                await self._recycle_context()
+            self._page_count += 1
+            page = await self.context.new_page()
         if url:
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+            try:
+                await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+            except Exception:
+                await page.close()
+                raise
         return page
 
 
+# ---------------------------------------------------------------------------
+# Shared browser sessions
+# Launching Chromium costs seconds, so tool handlers share one long-lived
+# BrowserSession per account and only open a fresh page per call.
+# ---------------------------------------------------------------------------
+_shared_sessions: dict[str, BrowserSession] = {}
+_shared_sessions_lock = asyncio.Lock()
+
+
+async def get_session(account: str = None) -> BrowserSession:
+    """Return the shared headless session for an account, launching it on first use."""
+    acc = account or CURRENT_ACCOUNT
+    async with _shared_sessions_lock:
+        session = _shared_sessions.get(acc)
+        if session is not None and session.browser.is_connected():
+            return session
+        if session is not None:
+            logger.warning(f"Shared browser for {acc} disconnected, relaunching")
+            await session.__aexit__(None, None, None)
+        session = await BrowserSession(headless=True, account=acc).__aenter__()
+        _shared_sessions[acc] = session
+        logger.info(f"Launched shared browser session for {acc}")
+        return session
+
+
+async def close_shared_session(account: str = None):
+    """Close an account's shared session so the next call relaunches with fresh cookies."""
+    acc = account or CURRENT_ACCOUNT
+    async with _shared_sessions_lock:
+        session = _shared_sessions.pop(acc, None)
+    if session is not None:
+        try:
+            await session.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error closing shared browser for {acc}: {e}")
+
+
+async def close_shared_sessions():
+    for acc in list(_shared_sessions):
+        await close_shared_session(acc)
+
+
+@asynccontextmanager
+async def shared_page(url=None, account: str = None):
+    """Open a page on the account's shared session and close it when done."""
+    session = await get_session(account)
+    page = await session.new_page(url)
+    try:
+        yield page
+    finally:
+        await page.close()
+
+
+async def wait_for_content(page, selector: str, timeout: int = 15000) -> bool:
+    """Wait until selector is attached, instead of sleeping a fixed time.
+    On timeout, log and let the caller extract whatever has rendered."""
+    try:
+        await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        return True
+    except Exception:
+        logger.warning(f"Timed out waiting for {selector}")
+        return False
+
+
 # ---------------------------------------------------------------------------
 # FastMCP tool definitions
 # Each @mcp.tool() wraps the existing do_* handlers.
@@ -552,6 +687,28 @@ def _extract(result: list) -> str:
     return result[0].text if result else "{}"
 
 
+# Responses go to MCP clients, not people; set MCP_PRETTY=1 to indent them when debugging
+_DUMPS_OPTION = orjson.OPT_INDENT_2 if os.getenv("MCP_PRETTY") else 0
+
+
+def _loads(data: str):
+    """Decode a page-side JSON.stringify result.
+    orjson rejects lone surrogate escapes (half an emoji) that the stdlib accepts."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Encode a tool response payload; orjson is several times faster than json on large scrapes.
+    Falls back to json for strings orjson refuses, such as a lone surrogate from a cut emoji."""
+    try:
+        return orjson.dumps(obj, option=_DUMPS_OPTION).decode()
+    except TypeError:
+        return json.dumps(obj, indent=2 if _DUMPS_OPTION else None)
+
+
 @mcp.tool()
 async def login_linkedin(account: Literal["carlos", "claudia"] = "carlos") -> str:
     """Step 1 of 2: Open LinkedIn login page in a visible browser window. Returns immediately — do NOT wait. After finishing manual login, call login_linkedin_save to capture the session."""
@@ -663,9 +820,10 @@ async def interact_with_linkedin_post(
     comment: Optional[str] = None,
     account: Literal["carlos", "claudia"] = "carlos",
     company_id: Optional[str] = None,
+    max_comments: int = 20,
 ) -> str:
     """Read, like, or comment on a LinkedIn post. Requires a post URL (get it from get_linkedin_posts or browse_linkedin_feed).
-    - action='read': extract full post content, author details, and all comments
+    - action='read': extract full post content, author details, and up to max_comments comments
     - action='like': like the post
     - action='comment': post a comment (requires 'comment' text)
     By default, carlos acts as the EcoSemantic company page. Pass company_id='personal' to act as the personal account."""
@@ -677,7 +835,7 @@ async def interact_with_linkedin_post(
     elif account == "carlos" and resolved_company is None:
         resolved_company = LINKEDIN_ACCOUNTS["carlos"]["company_id"]
 
-    return _extract(await do_interact_post(post_url, action, comment, resolved_company, account))
+    return _extract(await do_interact_post(post_url, action, comment, resolved_company, account, max_comments))
 
 
 
@@ -995,10 +1153,21 @@ def _login_port_file(account: str) -> Path:
 async def do_login_start(account: str = "carlos"):
     """Step 1: Launch Chromium with remote-debugging-port, return immediately."""
     import subprocess, socket, time as _time
+    from playwright.async_api import async_playwright
 
     if account not in LINKEDIN_ACCOUNTS:
         return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Unknown account: {account}"}))]
 
+    # Saved cookies may still be valid: check the feed headlessly before launching a visible browser
+    if (SESSIONS_DIR / get_cookie_filename(account)).exists():
+        try:
+            async with shared_page('https://www.linkedin.com/feed/', account=account) as page:
+                if '/feed' in page.url and 'login' not in page.url:
+                    await save_cookies(page, account)
+                    return [TextContent(type="text", text=json.dumps({"status": "success", "message": f"Already logged in as {account}. Cookies saved.", "account": account}))]
+        except Exception as e:
+            logger.warning(f"Headless session check failed for {account}: {e}")
+
     # Kill any leftover login browser for this account
     port_file = _login_port_file(account)
     if port_file.exists():
@@ -1121,6 +1290,7 @@ async def do_login_save(account: str = "carlos"):
     port = int(_port_data[0])
     _proc_pid = int(_port_data[1]) if len(_port_data) > 1 else None
 
+    from playwright.async_api import async_playwright
     try:
         pw = await async_playwright().start()
         browser = await pw.chromium.connect_over_cdp(f"http://localhost:{port}")
@@ -1152,6 +1322,8 @@ async def do_login_save(account: str = "carlos"):
         await browser.close()
         await pw.stop()
         port_file.unlink(missing_ok=True)
+        # Drop the shared scraping session so it picks up the new cookies
+        await close_shared_session(account)
         # Kill the whole Chromium tree by matching the CDP port
         import subprocess as _kill_sp
         try:
@@ -1185,27 +1357,47 @@ async def do_browse_feed(count: int, max_age_days: int = 0):
 
     if err := require_session(): return err
 
-    async with BrowserSession(headless=True) as session:
-        page = await session.new_page('https://www.linkedin.com/feed/')
-
+    async with shared_page('https://www.linkedin.com/feed/') as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
 
-        # Wait for feed to fully load
-        await page.wait_for_timeout(5000)
+        # Wait for the first feed post to render
+        await wait_for_content(page, FEED_POST_SELECTOR)
 
         # Scroll and collect posts
+        seen_urns = set()
         for scroll_attempt in range(min(count + 2, 10)):
-            new_posts = await page.evaluate('''() => {
+            # Scroll (after the first pass), wait for lazy-loaded posts and
+            # extract in a single round-trip
+            # Posts come back as one JSON string rather than per-property serialized objects
+            new_posts = _loads(await page.evaluate('''async ({seenUrns, scroll, selector}) => {
+                // Truncate without splitting a surrogate pair (emoji); a lone half breaks JSON decoding
+                const cap = (s, n) => {
+                    if (s.length <= n) return s;
+                    const c = s.charCodeAt(n - 1);
+                    return s.substring(0, c >= 0xD800 && c <= 0xDBFF ? n - 1 : n);
+                };
+                if (scroll) {
+                    // Wait up to 1.5 s, returning early once new posts are attached
+                    const before = document.querySelectorAll(selector).length;
+                    window.scrollBy(0, 600);
+                    const deadline = Date.now() + 1500;
+                    while (Date.now() < deadline && document.querySelectorAll(selector).length <= before) {
+                        await new Promise(r => setTimeout(r, 100));
+                    }
+                }
                 const posts = [];
+                // URNs collected on earlier scrolls are skipped before any DOM reads
+                const seen = new Set(seenUrns);
 
                 // Find posts by data-urn attribute containing activity (Dec 2025 selectors)
-                const containers = document.querySelectorAll('div.feed-shared-update-v2[data-urn^="urn:li:activity"]');
+                const containers = document.querySelectorAll(selector);
 
                 containers.forEach(container => {
                     try {
                         const urn = container.getAttribute('data-urn');
-                        if (!urn) return;
+                        if (!urn || seen.has(urn)) return;
+                        seen.add(urn);
 
                         // Author - use update-components-actor__title (Dec 2025)
                         const authorEl = container.querySelector('.update-components-actor__title span');
@@ -1221,7 +1413,7 @@ async def do_browse_feed(count: int, max_age_days: int = 0):
                             '.feed-shared-inline-show-more-text span[dir="ltr"], ' +
                             '.feed-shared-update-v2__description span[dir="ltr"]'
                         );
-                        const content = contentEl ? contentEl.innerText.trim().substring(0, 1000) : '';
+                        const content = contentEl ? cap(contentEl.innerText.trim(), 1000) : '';
 
                         // Reactions - look for social counts
                         const reactionsEl = container.querySelector('.social-details-social-counts__reactions-count, [class*="reactions-count"]');
@@ -1239,20 +1431,16 @@ async def do_browse_feed(count: int, max_age_days: int = 0):
                     } catch (e) { console.error(e); }
                 });
 
-                return posts;
-            }''')
+                return JSON.stringify(posts);
+            }''', {"seenUrns": list(seen_urns), "scroll": scroll_attempt > 0, "selector": FEED_POST_SELECTOR}))
 
-            for p in new_posts:
-                if not any(existing['urn'] == p['urn'] for existing in posts):
-                    posts.append(p)
+            posts.extend(new_posts)
+            seen_urns.update(p['urn'] for p in new_posts)
 
             if len(posts) >= count:
                 break
 
-            await page.evaluate('window.scrollBy(0, 600)')
-            await page.wait_for_timeout(1500)
-
-        await save_cookies(page)
+        save_cookies_later(page)
         
         # Apply date filter if specified
         if max_age_days > 0:
@@ -1265,13 +1453,13 @@ async def do_browse_feed(count: int, max_age_days: int = 0):
                 post['age_days'] = age_days
             filtered_posts = posts
         
-        return [TextContent(type="text", text=json.dumps({
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "posts": filtered_posts[:count],
             "total_found": len(posts),
             "total_after_filter": len(filtered_posts),
             "max_age_days": max_age_days
-        }, indent=2))]
+        }))]
 
 
 async def do_search_profiles(query: str, count: int):
@@ -1281,32 +1469,45 @@ async def do_search_profiles(query: str, count: int):
 
     if err := require_session(): return err
 
-    async with BrowserSession(headless=True) as session:
-        page = await session.new_page(f'https://www.linkedin.com/search/results/people/?keywords={encoded_query}')
-
+    async with shared_page(f'https://www.linkedin.com/search/results/people/?keywords={encoded_query}') as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
 
         # Wait for search results to load
-        await page.wait_for_timeout(5000)
+        await wait_for_content(page, 'main a[href*="/in/"]')
 
         # Extract profiles - LinkedIn now uses obfuscated classes, so we find by profile links
         profiles = await page.evaluate('''(count) => {
+            // Truncate without splitting a surrogate pair (emoji); a lone half breaks JSON encoding
+            const cap = (s, n) => {
+                if (s.length <= n) return s;
+                const c = s.charCodeAt(n - 1);
+                return s.substring(0, c >= 0xD800 && c <= 0xDBFF ? n - 1 : n);
+            };
             const profiles = [];
             const seenUrls = new Set();
+            // Patterns compiled once per call, not per line
+            const DEG_SUFFIX = /\\s*•\\s*\\d+(st|nd|rd|th)$/;
+            // Degree badges ("1st", "2nd", "3rd") checked by char code instead of regex per line
+            const SUFFIXES = ['st', 'nd', 'rd', 'th'];
+            const isDeg = l => l.length <= 5 && l.charCodeAt(0) >= 48 && l.charCodeAt(0) <= 57 && SUFFIXES.some(s => l.endsWith(s));
+            const ACTION = /^(Connect|Message|Follow)/;
+            const ACTION_OR_MUTUAL = /^(Connect|Message|Follow|\\d+ mutual)/;
             
-            // Find all links to profiles
-            const profileLinks = document.querySelectorAll('a[href*="/in/"]');
+            // Prefer anchors inside result cards so sidebar/nav links are never visited
+            const resultList = document.querySelector('.reusable-search__entity-result-list') || document;
+            let profileLinks = resultList.querySelectorAll('li.reusable-search__result-container a[href*="/in/"]');
+            if (!profileLinks.length) profileLinks = document.querySelectorAll('a[href*="/in/"]');
             
-            profileLinks.forEach(link => {
-                if (profiles.length >= count) return;
+            for (const link of profileLinks) {
+                if (profiles.length >= count) break;
                 
                 const url = link.href.split('?')[0];
-                if (seenUrls.has(url)) return;
+                if (seenUrls.has(url)) continue;
                 
                 // Get the text content which usually contains name and info
                 const text = link.innerText.trim();
-                if (!text || text.length < 3) return;
+                if (!text || text.length < 3) continue;
                 
                 // Look for the parent container that has all the info
                 // Go up to find a container with more details
@@ -1316,7 +1517,7 @@ async def do_search_profiles(query: str, count: int):
                 const lines = text.split('\\n').map(l => l.trim()).filter(l => l);
                 let name = lines[0] || 'Unknown';
                 // Remove connection indicators
-                name = name.replace(/\\s*•\\s*\\d+(st|nd|rd|th)$/, '').trim();
+                name = name.replace(DEG_SUFFIX, '').trim();
                 
                 // Try to find headline and location from the container
                 let headline = '';
@@ -1330,14 +1531,20 @@ async def do_search_profiles(query: str, count: int):
                     // Parse the lines - typically: Name, degree, headline, location, mutual connections
                     for (let i = 0; i < allLines.length; i++) {
                         const line = allLines[i];
-                        if (line.match(/^\\d+(st|nd|rd|th)$/)) {
+                        const bullet = line.lastIndexOf('•');
+                        // Third-degree badges read "3rd+"; report them as "3rd" like the old regex did
+                        let degTail = bullet >= 0 ? line.slice(bullet + 1).trim() : '';
+                        if (degTail.endsWith('+')) degTail = degTail.slice(0, -1);
+                        if (isDeg(line)) {
                             connectionDegree = line;
-                        } else if (line.includes('•') && line.match(/\\d+(st|nd|rd|th)/)) {
-                            connectionDegree = line.match(/\\d+(st|nd|rd|th)/)?.[0] || '';
-                        } else if (!headline && i > 0 && !line.match(/^(Connect|Message|Follow)/) && line.length > 10) {
+                        } else if (degTail && isDeg(degTail)) {
+                            connectionDegree = degTail;
+                        } else if (!headline && i > 0 && !ACTION.test(line) && line.length > 10) {
                             headline = line;
-                        } else if (headline && !location && !line.match(/^(Connect|Message|Follow|\\d+ mutual)/) && line.length > 3) {
+                        } else if (headline && !location && !ACTION_OR_MUTUAL.test(line) && line.length > 3) {
                             location = line;
+                            // Degree precedes the headline, so nothing useful follows the location
+                            break;
                         }
                     }
                 }
@@ -1346,24 +1553,118 @@ async def do_search_profiles(query: str, count: int):
                     seenUrls.add(url);
                     profiles.push({
                         name: name,
-                        headline: headline.substring(0, 200),
-                        location: location.substring(0, 100),
+                        headline: cap(headline, 200),
+                        location: cap(location, 100),
                         url: url,
                         connection_degree: connectionDegree
                     });
                 }
-            });
+            }
             
             return profiles;
         }''', count)
 
-        await save_cookies(page)
-        return [TextContent(type="text", text=json.dumps({
+        save_cookies_later(page)
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "profiles": profiles,
             "count": len(profiles),
             "query": query
-        }, indent=2))]
+        }))]
+
+
+# Extract main text + author slugs (via Y-position mapping)
+_SEARCH_EXTRACT_JS = r'''() => {
+    const main = document.querySelector('main');
+    if (!main) return JSON.stringify({text: '', slugs: []});
+    const text = main.innerText;
+
+    // Find "Feed post" screen-reader markers and their Y positions
+    const markers = [];
+    const walker = document.createTreeWalker(main, NodeFilter.SHOW_TEXT, {
+        acceptNode: (n) => n.textContent.trim() === 'Feed post' ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_REJECT
+    });
+    while (walker.nextNode()) {
+        markers.push(walker.currentNode.parentElement.getBoundingClientRect().top);
+    }
+    markers.sort((a, b) => a - b);
+
+    // Collect all profile/company links with Y positions
+    const links = [];
+    main.querySelectorAll('a[href*="/in/"], a[href*="/company/"]').forEach(a => {
+        const href = a.href;
+        const y = a.getBoundingClientRect().top;
+        const isCompany = href.includes('/company/');
+        const slug = isCompany
+            ? (href.match(/\/company\/([^/?]+)/)?.[1] || null)
+            : (href.match(/\/in\/([^/?]+)/)?.[1] || null);
+        if (slug) links.push({y, slug, isCompany});
+    });
+    links.sort((a, b) => a.y - b.y);
+
+    // For each marker, find the first link after it (before next marker)
+    const slugs = [];
+    for (let i = 0; i < markers.length; i++) {
+        const nextY = i + 1 < markers.length ? markers[i + 1] : Infinity;
+        const link = links.find(l => l.y > markers[i] && l.y < nextY);
+        slugs.push(link ? {slug: link.slug, isCompany: link.isCompany} : null);
+    }
+
+    return JSON.stringify({text, slugs});
+}'''
+
+
+async def _scrape_search_page(url: str, count: int, account: str) -> dict | None:
+    """Load the content-search results page, scroll for ~count posts, return its text and author slugs.
+    Returns None if the session is not logged in."""
+    async with shared_page(account=account) as page:
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+
+        if 'login' in page.url:
+            return None
+
+        # Each result carries a screen-reader "Feed post" marker
+        await wait_for_content(page, 'main >> text="Feed post"')
+
+        # Scroll to load more posts if needed
+        max_scrolls = max(0, (count - 5) // 5) + 1
+        if count <= 6:
+            max_scrolls = 0
+        for scroll_i in range(max_scrolls):
+            # Scroll, click "Load more" if present and let results render, in one round-trip
+            await page.evaluate(r'''async () => {
+                const sleep = ms => new Promise(r => setTimeout(r, ms));
+                const countMarkers = () => {
+                    const main = document.querySelector('main');
+                    if (!main) return 0;
+                    const walker = document.createTreeWalker(main, NodeFilter.SHOW_TEXT, {
+                        acceptNode: (n) => n.textContent.trim() === 'Feed post' ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_REJECT
+                    });
+                    let n = 0;
+                    while (walker.nextNode()) n++;
+                    return n;
+                };
+                // Wait up to ms, returning early once new results are attached
+                const waitForMore = async (before, ms) => {
+                    const deadline = Date.now() + ms;
+                    while (Date.now() < deadline && countMarkers() <= before) await sleep(100);
+                };
+                let before = countMarkers();
+                window.scrollTo(0, document.body.scrollHeight);
+                await waitForMore(before, 3000);
+                const btns = [...document.querySelectorAll('button')];
+                const lb = btns.find(b => b.innerText.trim().toLowerCase() === 'load more');
+                if (lb) {
+                    before = countMarkers();
+                    lb.click();
+                    await waitForMore(before, 1500);
+                }
+            }''')
+            logger.info(f"Scroll {scroll_i+1}/{max_scrolls} ({url})")
+
+        extraction = _loads(await page.evaluate(_SEARCH_EXTRACT_JS))
+        save_cookies_later(page)
+        return extraction
 
 
 async def do_search_posts(
@@ -1385,81 +1686,17 @@ async def do_search_posts(
     url = "https://www.linkedin.com/search/results/content/?" + _up.urlencode(params, quote_via=_up.quote)
     logger.info(f"search_posts_v2 URL: {url}")
 
-    async with BrowserSession(headless=True, account=account) as session:
-        page = await session.new_page()
-        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-
-        if 'login' in page.url:
-            return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
+    # Content search has no page= pagination (it grows via "Load more"), so one tab scrolls for all of count
+    extraction = await _scrape_search_page(url, count, account)
 
-        await page.wait_for_timeout(5000)
+    if extraction is None:
+        return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
 
-        # Scroll to load more posts if needed
-        max_scrolls = max(0, (count - 5) // 5) + 1
-        if count <= 6:
-            max_scrolls = 0
-        for scroll_i in range(max_scrolls):
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(3000)
-            # Click "Load more" button if present
-            await page.evaluate(r'''() => {
-                const btns = [...document.querySelectorAll('button')];
-                const lb = btns.find(b => b.innerText.trim().toLowerCase() === 'load more');
-                if (lb) lb.click();
-            }''')
-            await page.wait_for_timeout(1500)
-            logger.info(f"Scroll {scroll_i+1}/{max_scrolls}")
-
-        # Extract main text + author slugs (via Y-position mapping)
-        extraction = await page.evaluate(r'''() => {
-            const main = document.querySelector('main');
-            if (!main) return {text: '', slugs: []};
-            const text = main.innerText;
-
-            // Find "Feed post" screen-reader markers and their Y positions
-            const markers = [];
-            const walker = document.createTreeWalker(main, NodeFilter.SHOW_TEXT, {
-                acceptNode: (n) => n.textContent.trim() === 'Feed post' ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_REJECT
-            });
-            while (walker.nextNode()) {
-                markers.push(walker.currentNode.parentElement.getBoundingClientRect().top);
-            }
-            markers.sort((a, b) => a - b);
-
-            // Collect all profile/company links with Y positions
-            const links = [];
-            main.querySelectorAll('a[href*="/in/"], a[href*="/company/"]').forEach(a => {
-                const href = a.href;
-                const y = a.getBoundingClientRect().top;
-                const isCompany = href.includes('/company/');
-                const slug = isCompany
-                    ? (href.match(/\/company\/([^/?]+)/)?.[1] || null)
-                    : (href.match(/\/in\/([^/?]+)/)?.[1] || null);
-                if (slug) links.push({y, slug, isCompany});
-            });
-            links.sort((a, b) => a.y - b.y);
-
-            // For each marker, find the first link after it (before next marker)
-            const slugs = [];
-            for (let i = 0; i < markers.length; i++) {
-                const nextY = i + 1 < markers.length ? markers[i + 1] : Infinity;
-                const link = links.find(l => l.y > markers[i] && l.y < nextY);
-                slugs.push(link ? {slug: link.slug, isCompany: link.isCompany} : null);
-            }
-
-            return {text, slugs};
-        }''')
-
-        main_text = extraction['text']
-        author_slugs = extraction['slugs']
-
-        await save_cookies(page)
-
-    if not main_text:
+    if not extraction['text']:
         return [TextContent(type="text", text=json.dumps({"status": "error", "message": "No content on search results page"}))]
 
     # Parse posts from DOM text with author slugs
-    posts = _parse_search_posts(main_text, author_slugs)
+    posts = _parse_search_posts(extraction['text'], extraction['slugs'])
     logger.info(f"search_posts_v2 parsed {len(posts)} posts")
 
     # Client-side author filter
@@ -1471,7 +1708,7 @@ async def do_search_posts(
     if max_age_days > 0:
         posts = [p for p in posts if p["age_days"] <= max_age_days]
 
-    return [TextContent(type="text", text=json.dumps({
+    return [TextContent(type="text", text=_dumps({
         "status": "success",
         "posts": posts[:count],
         "total_found": len(posts),
@@ -1482,7 +1719,7 @@ async def do_search_posts(
             "author_name": author_name,
             "max_age_days": max_age_days if max_age_days > 0 else None,
         }
-    }, indent=2))]
+    }))]
 
 
 def _parse_search_posts(main_text: str, author_slugs: list[dict | None] = None) -> list[dict]:
@@ -1582,9 +1819,7 @@ async def do_view_profile(profile_url: str):
 
     if err := require_session(): return err
 
-    async with BrowserSession(headless=True) as session:
-        page = await session.new_page(profile_url)
-
+    async with shared_page(profile_url) as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
 
@@ -1594,39 +1829,36 @@ async def do_view_profile(profile_url: str):
         except:
             logger.warning("Profile card selector timeout")
 
-        await page.wait_for_timeout(3000)
+        # Sections below the top card load lazily; give them a short bounded wait
+        await wait_for_content(page, '#about, #experience', timeout=5000)
 
         # Extract profile data - using robust approach since LinkedIn uses obfuscated classes
-        profile = await page.evaluate('''() => {
+        profile = _loads(await page.evaluate('''() => {
             const data = {};
+            // Truncate without splitting a surrogate pair (emoji); a lone half breaks JSON decoding
+            const cap = (s, n) => {
+                if (s.length <= n) return s;
+                const c = s.charCodeAt(n - 1);
+                return s.substring(0, c >= 0xD800 && c <= 0xDBFF ? n - 1 : n);
+            };
+
+            // Every top-card field is looked up inside the top card, not the whole document
+            const topCard = document.querySelector('.pv-top-card, [class*="top-card"]') || document;
 
             // Name - find h1 with inline class (most reliable)
-            const nameEl = document.querySelector('h1.inline, h1[class*="inline"]');
-            data.name = nameEl ? nameEl.innerText.trim() : null;
+            const nameEl = topCard.querySelector('h1.inline, h1[class*="inline"]')
+                || document.querySelector('h1.inline, h1[class*="inline"]');
+            data.name = nameEl ? nameEl.textContent.trim() : null;
 
-            // Headline - text-body-medium near the name, usually the first one in top card
-            const topCard = document.querySelector('.pv-top-card, [class*="top-card"]') || document;
-            // Try multiple approaches for headline
-            let headline = null;
-            // First try: .text-body-medium directly
-            const headlineEl = document.querySelector('.text-body-medium');
-            if (headlineEl) {
-                headline = headlineEl.innerText.trim();
-            }
-            // Second try: look for div right after h1
-            if (!headline) {
-                const h1 = document.querySelector('h1.inline, h1[class*="inline"]');
-                if (h1 && h1.nextElementSibling) {
-                    headline = h1.nextElementSibling.innerText.trim();
-                }
-            }
-            data.headline = headline;
+            // Headline - text-body-medium near the name, falling back to the element after h1
+            const headlineEl = topCard.querySelector('.text-body-medium') || nameEl?.nextElementSibling;
+            data.headline = (headlineEl && headlineEl.textContent.trim()) || null;
 
             // Location - look for location pattern in top card area
             // Usually appears after headline, contains city/country
             const textSmalls = topCard.querySelectorAll('.text-body-small span');
             for (const el of textSmalls) {
-                const text = el.innerText.trim();
+                const text = el.textContent.trim();
                 // Skip if it contains connection/follower info or is too long
                 if (text && text.length > 3 && text.length < 80 &&
                     !text.includes('connection') && !text.includes('follower') &&
@@ -1636,10 +1868,15 @@ async def do_view_profile(profile_url: str):
                 }
             }
 
-            // Connection info - look for text with "connection" or "follower"
-            const allText = document.body.innerText;
-            const connMatch = allText.match(/(\\d+[\\+,]?\\d*\\s*(connections?|followers?))/i);
-            data.connections = connMatch ? connMatch[0] : null;
+            // Connection info - read the top-card link/bullet, falling back to a regex over
+            // the top card only; the whole page's innerText forces a full layout
+            const connEl = topCard.querySelector('a[href*="/search/results/people"] span, .pv-top-card--list-bullet li');
+            let connections = connEl ? connEl.innerText.trim() : '';
+            if (!/connection|follower/i.test(connections)) {
+                const connMatch = ((topCard === document ? document.body : topCard).innerText || '').match(/(\\d+[\\+,]?\\d*\\s*(connections?|followers?))/i);
+                connections = connMatch ? connMatch[0] : '';
+            }
+            data.connections = connections || null;
 
             // About section - find section with id="about" and get the actual content
             const aboutSection = document.querySelector('#about');
@@ -1651,7 +1888,7 @@ async def do_view_profile(profile_url: str):
                     for (const span of spans) {
                         const text = span.innerText.trim();
                         if (text && text.length > 20 && text !== 'About') {
-                            data.about = text.substring(0, 500);
+                            data.about = cap(text, 500);
                             break;
                         }
                     }
@@ -1677,15 +1914,15 @@ async def do_view_profile(profile_url: str):
                 }
             }
 
-            return data;
-        }''')
+            return JSON.stringify(data);
+        }'''))
 
-        await save_cookies(page)
-        return [TextContent(type="text", text=json.dumps({
+        save_cookies_later(page)
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "profile": profile,
             "url": profile_url
-        }, indent=2))]
+        }))]
 
 
 async def do_get_posts(profile_url: str, count: int = 5):
@@ -1703,15 +1940,19 @@ async def do_get_posts(profile_url: str, count: int = 5):
     if not url.endswith("/posts/") and not url.endswith("/posts"):
         url = url.rstrip("/") + "/posts/"
 
-    async with BrowserSession(headless=True) as session:
-        page = await session.new_page(url)
-
+    async with shared_page(url) as page:
         if "login" in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Not logged in"}))]
 
-        await page.wait_for_timeout(4000)
+        await wait_for_content(page, 'a[href*="/feed/update/"]')
 
         posts = await page.evaluate('''(count) => {
+            // Truncate without splitting a surrogate pair (emoji); a lone half breaks JSON encoding
+            const cap = (s, n) => {
+                if (s.length <= n) return s;
+                const c = s.charCodeAt(n - 1);
+                return s.substring(0, c >= 0xD800 && c <= 0xDBFF ? n - 1 : n);
+            };
             const results = [];
             const seen = new Set();
             const links = document.querySelectorAll('a[href*="/feed/update/"]');
@@ -1728,28 +1969,153 @@ async def do_get_posts(profile_url: str, count: int = 5):
                                 a.closest("li") ||
                                 a.parentElement;
 
-                const content = container ? container.innerText.trim().substring(0, 300) : "";
+                const content = container ? cap(container.innerText.trim(), 300) : "";
                 // Extract URN from href
                 const urnMatch = href.match(/urn:li:activity:\d+/);
                 results.push({
                     url: href,
                     urn: urnMatch ? urnMatch[0] : null,
-                    preview: content.replace(/\s+/g, " ").substring(0, 200)
+                    preview: cap(content.replace(/\s+/g, " "), 200)
                 });
             });
             return results;
         }''', count)
 
-        await save_cookies(page)
-        return [TextContent(type="text", text=json.dumps({
+        save_cookies_later(page)
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "posts": posts,
             "count": len(posts),
             "source": url
-        }, indent=2))]
+        }))]
+
+
+# Extract post content and comments (up to maxComments)
+_SCRAPE_POST_JS = r'''async (maxComments) => {
+    // Comments come back as parallel arrays so field names aren't repeated per comment
+    const data = { post: {} };
+
+    // Author - use updated selectors
+    const authorEl = document.querySelector('.update-components-actor__title span');
+    data.post.author = authorEl ? authorEl.innerText.trim().split('\n')[0] : 'Unknown';
+
+    // Author headline/description
+    const authorDescEl = document.querySelector('.update-components-actor__description');
+    data.post.author_headline = authorDescEl ? authorDescEl.innerText.trim() : '';
+
+    // Post date
+    const dateEl = document.querySelector('.update-components-actor__sub-description');
+    data.post.date = dateEl ? dateEl.innerText.trim().split('\n')[0] : '';
+
+    // Content
+    const contentEl = document.querySelector(
+        '.feed-shared-update-v2__description .feed-shared-inline-show-more-text span[dir="ltr"], ' +
+        '.feed-shared-inline-show-more-text span[dir="ltr"]'
+    );
+    data.post.content = contentEl ? contentEl.innerText.trim() : '';
+
+    // Reactions
+    const reactionsEl = document.querySelector('.social-details-social-counts__reactions-count');
+    data.post.reactions = reactionsEl ? reactionsEl.textContent.trim() : '0';
+
+    // Comments count
+    const commentsCountEl = document.querySelector('.social-details-social-counts__comments');
+    data.post.comments_count = commentsCountEl ? commentsCountEl.textContent.trim() : '0';
+
+    // Extract comments using correct selectors (Dec 2025)
+    // Use comments-comment-entity as the main container for each comment
+    const commentElements = document.querySelectorAll('.comments-comment-entity');
+    // Dedup on a 32-bit FNV-1a of author + '|' + first 50 chars of text,
+    // hashed in place so no key string is built per comment
+    const fnv1a = (s, h, end) => {
+        for (let i = 0; i < end; i++) {
+            h ^= s.charCodeAt(i);
+            h = Math.imul(h, 16777619);
+        }
+        return h;
+    };
+    const commentKey = (author, text) => {
+        let h = fnv1a(author, 2166136261, author.length);
+        h = Math.imul(h ^ 124, 16777619);  // '|'
+        return fnv1a(text, h, Math.min(text.length, 50)) >>> 0;
+    };
+    const seenComments = new Set();
+    // Truncate only when over the limit, and never between the halves of a surrogate pair (emoji)
+    const cap = (s, n) => {
+        if (s.length <= n) return s;
+        const c = s.charCodeAt(n - 1);
+        return s.substring(0, c >= 0xD800 && c <= 0xDBFF ? n - 1 : n);
+    };
+    const AUTHOR_SEL = '.comments-comment-meta__description-title';
+    const HEADLINE_SEL = '.comments-comment-meta__description-subtitle';
+    const TEXT_SEL = '.comments-comment-item__main-content';
+    const TIME_SEL = 'time, .comments-comment-item__timestamp';
+    const META_SEL = '.comments-comment-meta__data';
+    const DATE_RE = /(\d+[hdwmo]|\d+ (?:hour|day|week|month|year)s? ago)/i;
+
+    // Yield to the event loop every BATCH nodes so huge threads don't block the renderer
+    const BATCH = 100;
+    const yieldToPage = () => new Promise(r => setTimeout(r, 0));
+
+    // Output arrays are sized to the most comments we can return and trimmed after
+    const size = Math.max(0, Math.min(maxComments, commentElements.length));
+    data.authors = new Array(size);
+    data.headlines = new Array(size);
+    data.texts = new Array(size);
+    data.dates = new Array(size);
+    let k = 0;
+    for (let i = 0, n = commentElements.length; i < n; i++) {
+        if (k >= size) break;
+        if (i && i % BATCH === 0) await yieldToPage();
+        const commentEl = commentElements[i];
+        try {
+            // Comment author - in description-title
+            const commentAuthorEl = commentEl.querySelector(AUTHOR_SEL);
+            const commentAuthor = commentAuthorEl ? commentAuthorEl.innerText.trim().split('\n')[0] : 'Unknown';
+
+            // Comment text - in main-content
+            const commentTextEl = commentEl.querySelector(TEXT_SEL);
+            const commentText = commentTextEl ? commentTextEl.innerText.trim() : '';
+
+            // Cheap rejections first, then duplicates, before reading the remaining fields
+            if (!commentText || commentAuthor === 'Unknown') continue;
+            const uniqueKey = commentKey(commentAuthor, commentText);
+            if (seenComments.has(uniqueKey)) continue;
+            seenComments.add(uniqueKey);
+
+            // Author headline - in description-subtitle
+            const authorHeadlineEl = commentEl.querySelector(HEADLINE_SEL);
+            const authorHeadline = authorHeadlineEl ? authorHeadlineEl.innerText.trim().split('\n')[0] : '';
+
+            // Comment date - look for time element or text with time pattern
+            const timeEl = commentEl.querySelector(TIME_SEL);
+            let commentDate = '';
+            if (timeEl) {
+                commentDate = timeEl.innerText.trim();
+            } else {
+                // Try to find date in the meta area (usually like "5d" or "2h")
+                const metaEl = commentEl.querySelector(META_SEL);
+                if (metaEl) {
+                    const metaText = metaEl.textContent;
+                    const match = DATE_RE.exec(metaText);
+                    if (match) commentDate = match[0];
+                }
+            }
+
+            data.authors[k] = commentAuthor;
+            data.headlines[k] = cap(authorHeadline, 150);
+            data.texts[k] = cap(commentText, 500);
+            data.dates[k] = commentDate;
+            k++;
+        } catch (e) { console.error(e); }
+    }
+    data.authors.length = data.headlines.length = data.texts.length = data.dates.length = k;
+
+    return JSON.stringify(data);
+}'''
 
 
-async def do_interact_post(post_url: str, action: str, comment: str = None, company_id: str = None, account: str = None):
+async def do_interact_post(post_url: str, action: str, comment: str = None, company_id: str = None, account: str = None, max_comments: int = 20):
     """Interact with a LinkedIn post - read, like, or comment.
     
     Args:
@@ -1770,14 +2136,12 @@ async def do_interact_post(post_url: str, action: str, comment: str = None, comp
         post_url = f"{post_url}{separator}actorCompanyId={company_id}"
         logger.info(f"Commenting as company ID: {company_id}")
 
-    async with BrowserSession(headless=True, account=account) as session:
-        page = await session.new_page(post_url)
-
+    async with shared_page(post_url, account=account) as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Not logged in for account: {account}"}))]
 
         # Wait for post to load
-        await page.wait_for_timeout(5000)
+        await wait_for_content(page, '.update-components-actor__title, .feed-shared-update-v2')
         
         # Handle COMMENT action
         if action == "comment":
@@ -1803,7 +2167,7 @@ async def do_interact_post(post_url: str, action: str, comment: str = None, comp
                         comment_box = page.locator('.ql-editor[contenteditable="true"]')
                 
                 if await comment_box.count() == 0:
-                    await save_cookies(page)
+                    save_cookies_later(page)
                     return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find comment input box"}))]
                 
                 # Type the comment
@@ -1861,23 +2225,23 @@ async def do_interact_post(post_url: str, action: str, comment: str = None, comp
                             new_content = await comment_box.first.inner_text()
                             if len(new_content.strip()) < 5:
                                 logger.info("Comment box cleared - likely posted successfully")
-                                await save_cookies(page)
+                                save_cookies_later(page)
                                 return [TextContent(type="text", text=json.dumps({"status": "success", "action": "comment", "message": "Comment posted successfully"}))]
                         except:
                             pass
                         
-                        await save_cookies(page)
+                        save_cookies_later(page)
                         return [TextContent(type="text", text=json.dumps({"status": "uncertain", "action": "comment", "message": "Submit clicked but could not verify if posted"}))]
                     else:
-                        await save_cookies(page)
+                        save_cookies_later(page)
                         return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Submit button found but not enabled"}))]
                 else:
-                    await save_cookies(page)
+                    save_cookies_later(page)
                     return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find submit button"}))]
                     
             except Exception as e:
                 logger.error(f"Comment error: {e}")
-                await save_cookies(page)
+                save_cookies_later(page)
                 return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Failed to post comment: {str(e)}"}))]
         
         # Handle LIKE action
@@ -1932,14 +2296,14 @@ async def do_interact_post(post_url: str, action: str, comment: str = None, comp
                 if await like_btn.count() > 0:
                     await like_btn.first.click()
                     await page.wait_for_timeout(2000)
-                    await save_cookies(page)
+                    save_cookies_later(page)
                     actor = f"company:{company_id}" if company_id else f"personal:{account}"
                     return [TextContent(type="text", text=json.dumps({"status": "success", "action": "like", "message": f"Post liked as {actor}"}))]
                 else:
-                    await save_cookies(page)
+                    save_cookies_later(page)
                     return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find like button"}))]
             except Exception as e:
-                await save_cookies(page)
+                save_cookies_later(page)
                 return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Failed to like: {str(e)}"}))]
 
         # Handle READ action (default) - Click to load comments if there's a comments button
@@ -1952,95 +2316,22 @@ async def do_interact_post(post_url: str, action: str, comment: str = None, comp
             pass
 
         # Extract post content and comments
-        post_data = await page.evaluate('''() => {
-            const data = { post: {}, comments: [] };
-
-            // Author - use updated selectors
-            const authorEl = document.querySelector('.update-components-actor__title span');
-            data.post.author = authorEl ? authorEl.innerText.trim().split('\\n')[0] : 'Unknown';
-
-            // Author headline/description
-            const authorDescEl = document.querySelector('.update-components-actor__description');
-            data.post.author_headline = authorDescEl ? authorDescEl.innerText.trim() : '';
-
-            // Post date
-            const dateEl = document.querySelector('.update-components-actor__sub-description');
-            data.post.date = dateEl ? dateEl.innerText.trim().split('\\n')[0] : '';
-
-            // Content
-            const contentEl = document.querySelector(
-                '.feed-shared-update-v2__description .feed-shared-inline-show-more-text span[dir="ltr"], ' +
-                '.feed-shared-inline-show-more-text span[dir="ltr"]'
-            );
-            data.post.content = contentEl ? contentEl.innerText.trim() : '';
-
-            // Reactions
-            const reactionsEl = document.querySelector('.social-details-social-counts__reactions-count');
-            data.post.reactions = reactionsEl ? reactionsEl.innerText.trim() : '0';
-
-            // Comments count
-            const commentsCountEl = document.querySelector('.social-details-social-counts__comments');
-            data.post.comments_count = commentsCountEl ? commentsCountEl.innerText.trim() : '0';
-
-            // Extract comments using correct selectors (Dec 2025)
-            // Use comments-comment-entity as the main container for each comment
-            const commentElements = document.querySelectorAll('.comments-comment-entity');
-            const seenComments = new Set();
-            
-            commentElements.forEach(commentEl => {
-                try {
-                    // Comment author - in description-title
-                    const commentAuthorEl = commentEl.querySelector('.comments-comment-meta__description-title');
-                    const commentAuthor = commentAuthorEl ? commentAuthorEl.innerText.trim().split('\\n')[0] : 'Unknown';
-                    
-                    // Author headline - in description-subtitle
-                    const authorHeadlineEl = commentEl.querySelector('.comments-comment-meta__description-subtitle');
-                    const authorHeadline = authorHeadlineEl ? authorHeadlineEl.innerText.trim().split('\\n')[0] : '';
-                    
-                    // Comment text - in main-content
-                    const commentTextEl = commentEl.querySelector('.comments-comment-item__main-content');
-                    const commentText = commentTextEl ? commentTextEl.innerText.trim() : '';
-                    
-                    // Comment date - look for time element or text with time pattern
-                    const timeEl = commentEl.querySelector('time, .comments-comment-item__timestamp');
-                    let commentDate = '';
-                    if (timeEl) {
-                        commentDate = timeEl.innerText.trim();
-                    } else {
-                        // Try to find date in the meta area (usually like "5d" or "2h")
-                        const metaText = commentEl.querySelector('.comments-comment-meta__data');
-                        if (metaText) {
-                            const match = metaText.innerText.match(/(\\d+[hdwmo]|\\d+ (?:hour|day|week|month|year)s? ago)/i);
-                            if (match) commentDate = match[0];
-                        }
-                    }
-                    
-                    // Create unique key to avoid duplicates
-                    const uniqueKey = commentAuthor + '|' + commentText.substring(0, 50);
-                    
-                    if (commentText && commentAuthor !== 'Unknown' && !seenComments.has(uniqueKey)) {
-                        seenComments.add(uniqueKey);
-                        data.comments.push({
-                            author: commentAuthor,
-                            author_headline: authorHeadline.substring(0, 150),
-                            text: commentText.substring(0, 500),
-                            date: commentDate
-                        });
-                    }
-                } catch (e) { console.error(e); }
-            });
+        post_data = _loads(await page.evaluate(_SCRAPE_POST_JS, max_comments))
 
-            return data;
-        }''')
+        comments = [
+            {"author": author, "author_headline": headline, "text": text, "date": date}
+            for author, headline, text, date in zip(
+                post_data["authors"], post_data["headlines"], post_data["texts"], post_data["dates"])
+        ]
 
-        await save_cookies(page)
-        return [TextContent(type="text", text=json.dumps({
+        save_cookies_later(page)
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "action": action,
             "post": post_data["post"],
-            "comments": post_data["comments"],
-            "comments_found": len(post_data["comments"])
-        }, indent=2))]
+            "comments": comments,
+            "comments_found": len(comments)
+        }))]
 
 
 async def do_create_post(content: str, company_id: str = None, account: str = None, group_name: str = None):
@@ -2059,9 +2350,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
     if err := require_session(account):
         return err
 
-    async with BrowserSession(headless=True, account=account) as session:
-        page = await session.new_page("https://www.linkedin.com/feed/")
-
+    async with shared_page("https://www.linkedin.com/feed/", account=account) as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Not logged in for account: {account}"}))]
 
@@ -2070,7 +2359,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
         # --- Step 1: Open the post editor modal ---
         start_btn = page.locator('button:has-text("Start a post")')
         if await start_btn.count() == 0:
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find 'Start a post' button"}))]
 
         await start_btn.first.click()
@@ -2101,7 +2390,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
                 }}""", group_name)
 
                 if not matched:
-                    await save_cookies(page)
+                    save_cookies_later(page)
                     return [TextContent(type="text", text=json.dumps({
                         "status": "error",
                         "message": f"No group matching '{group_name}' found. Use list_linkedin_groups to see available groups."
@@ -2123,7 +2412,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
 
             except Exception as e:
                 logger.warning(f"Group selection failed: {e} — aborting")
-                await save_cookies(page)
+                save_cookies_later(page)
                 return [TextContent(type="text", text=json.dumps({
                     "status": "error",
                     "message": f"Group selection failed: {e}"
@@ -2177,7 +2466,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
         # --- Step 3: Type the post content ---
         editor = page.locator('div.ql-editor[role="textbox"]')
         if await editor.count() == 0:
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find post editor"}))]
 
         await editor.first.click()
@@ -2192,7 +2481,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
             await page.wait_for_timeout(2000)
 
         if await post_btn.first.is_disabled():
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Post button still disabled after typing"}))]
 
         await post_btn.first.click()
@@ -2202,7 +2491,7 @@ async def do_create_post(content: str, company_id: str = None, account: str = No
         # Verify: the share-creation editor should disappear after successful post
         dialog_count = await page.locator('div.share-creation-state, div.ql-editor').count()
         actor = f"group:{group_name}" if group_name else (f"company:{company_id}" if company_id else f"personal:{account}")
-        await save_cookies(page)
+        save_cookies_later(page)
 
         if dialog_count == 0:
             return [TextContent(type="text", text=json.dumps({
@@ -2227,9 +2516,7 @@ async def do_list_groups(account: str = None):
     if err := require_session(account):
         return err
 
-    async with BrowserSession(headless=True, account=account) as session:
-        page = await session.new_page("https://www.linkedin.com/feed/")
-
+    async with shared_page("https://www.linkedin.com/feed/", account=account) as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Not logged in for account: {account}"}))]
 
@@ -2238,7 +2525,7 @@ async def do_list_groups(account: str = None):
         # Open editor
         start_btn = page.locator('button:has-text("Start a post")')
         if await start_btn.count() == 0:
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find 'Start a post' button"}))]
 
         await start_btn.first.click()
@@ -2267,13 +2554,13 @@ async def do_list_groups(account: str = None):
             });
         }''')
 
-        await save_cookies(page)
-        return [TextContent(type="text", text=json.dumps({
+        save_cookies_later(page)
+        return [TextContent(type="text", text=_dumps({
             "status": "success",
             "account": account,
             "groups_count": len(groups),
             "groups": groups
-        }, indent=2))]
+        }))]
 
 
 async def do_delete_post(post_url: str, account: str = None):
@@ -2291,9 +2578,7 @@ async def do_delete_post(post_url: str, account: str = None):
     if err := require_session(account):
         return err
 
-    async with BrowserSession(headless=True, account=account) as session:
-        page = await session.new_page(post_url)
-
+    async with shared_page(post_url, account=account) as page:
         if 'login' in page.url:
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": f"Not logged in for account: {account}"}))]
 
@@ -2302,7 +2587,7 @@ async def do_delete_post(post_url: str, account: str = None):
         # Step 1: Click ••• menu
         menu_btn = page.locator('button.feed-shared-control-menu__trigger')
         if await menu_btn.count() == 0:
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Could not find post control menu (•••). You may not own this post."}))]
 
         await menu_btn.first.click()
@@ -2312,7 +2597,7 @@ async def do_delete_post(post_url: str, account: str = None):
         delete_item = page.locator('.artdeco-dropdown__content--is-open >> text="Delete post"')
         if await delete_item.count() == 0:
             await page.keyboard.press("Escape")
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "No 'Delete post' option in menu. You may not own this post."}))]
 
         await delete_item.first.click()
@@ -2324,13 +2609,13 @@ async def do_delete_post(post_url: str, account: str = None):
             '[role="dialog"] button.artdeco-button--primary:has-text("Delete")'
         )
         if await confirm_btn.count() == 0:
-            await save_cookies(page)
+            save_cookies_later(page)
             return [TextContent(type="text", text=json.dumps({"status": "error", "message": "Confirmation dialog did not appear"}))]
 
         await confirm_btn.first.click()
         await page.wait_for_timeout(3000)
         logger.info(f"Deleted post: {post_url}")
-        await save_cookies(page)
+        save_cookies_later(page)
 
         return [TextContent(type="text", text=json.dumps({
             "status": "success",
@@ -2341,6 +2626,12 @@ async def do_delete_post(post_url: str, account: str = None):
 
 if __name__ == "__main__":
     port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else 8988
+    # libuv-backed loop for the HTTP transport; not available on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     mcp.run(
         transport="streamable-http",
         host="0.0.0.0",
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+import linkedin_browser_mcp as mcp_server
+from linkedin_browser_mcp import COOKIE_REFRESH_SECONDS, parse_linkedin_date, save_cookies
+
+
+class FakeContext:
+    def __init__(self, cookies):
+        self._account = 'tester'
+        self._cookies = cookies
+
+    async def cookies(self):
+        return self._cookies
+
+
+class FakePage:
+    def __init__(self, cookies):
+        self.context = FakeContext(cookies)
+
+
+@pytest.fixture
+def sessions_dir(tmp_path, monkeypatch):
+    """Point cookie storage at a temp dir and reset the module's cached state."""
+    monkeypatch.setattr(mcp_server, 'SESSIONS_DIR', tmp_path)
+    monkeypatch.setattr(mcp_server, 'KEY_FILE', tmp_path / 'encryption.key')
+    monkeypatch.setattr(mcp_server, '_sessions_dir_ready', False)
+    monkeypatch.setattr(mcp_server, '_fernet', None)
+    monkeypatch.setattr(mcp_server, '_last_cookie_save', {})
+    return tmp_path
+
+
+def saved_timestamp(sessions_dir):
+    encrypted = (sessions_dir / 'linkedin_tester_cookies.json').read_bytes()
+    return json.loads(mcp_server._get_fernet().decrypt(encrypted))['timestamp']
+
+
+@pytest.mark.asyncio
+async def test_save_cookies_skips_unchanged_cookies(sessions_dir, monkeypatch):
+    page = FakePage([{'name': 'li_at', 'value': 'abc', 'domain': '.linkedin.com'}])
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: 1000.0)
+    await save_cookies(page)
+    assert saved_timestamp(sessions_dir) == 1000
+
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: 1010.0)
+    await save_cookies(page)
+    assert saved_timestamp(sessions_dir) == 1000
+
+
+@pytest.mark.asyncio
+async def test_save_cookies_rewrites_changed_cookies(sessions_dir, monkeypatch):
+    page = FakePage([{'name': 'li_at', 'value': 'abc', 'domain': '.linkedin.com'}])
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: 1000.0)
+    await save_cookies(page)
+
+    page.context._cookies = [{'name': 'li_at', 'value': 'xyz', 'domain': '.linkedin.com'}]
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: 1010.0)
+    await save_cookies(page)
+    assert saved_timestamp(sessions_dir) == 1010
+
+
+@pytest.mark.asyncio
+async def test_save_cookies_refreshes_unchanged_cookies_after_interval(sessions_dir, monkeypatch):
+    page = FakePage([{'name': 'li_at', 'value': 'abc', 'domain': '.linkedin.com'}])
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: 1000.0)
+    await save_cookies(page)
+
+    later = 1000.0 + COOKIE_REFRESH_SECONDS + 1
+    monkeypatch.setattr(mcp_server.time, 'time', lambda: later)
+    await save_cookies(page)
+    assert saved_timestamp(sessions_dir) == int(later)
+
+
+@pytest.mark.parametrize('date_str, age_days', [
+    ('3h', 0),
+    ('3d', 3),
+    ('2w', 14),
+    ('1mo', 30),
+    ('1yr', 365),
+    ('5 hours ago', 0),
+    ('3 days ago', 3),
+    ('2 weeks', 14),
+    ('1 month ago', 30),
+    ('1 year ago', 365),
+    ('Just now', 0),
+    ('2d • Edited', 2),
+    ('3w · ', 21),
+    ('4d Edited', 4),
+    ('', 0),
+    ('garbage', 0),
+])
+def test_parse_linkedin_date_age(date_str, age_days):
+    _, days = parse_linkedin_date(date_str)
+    assert days == age_days
+
+
+def test_parse_linkedin_date_hours_offset():
+    parsed, _ = parse_linkedin_date('5h')
+    now, _ = parse_linkedin_date('')
+    assert 4.9 * 3600 < (now - parsed).total_seconds() < 5.1 * 3600
@@ -0,0 +1,33 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from linkedin_browser_mcp import _SCRAPE_POST_JS, _dumps, _loads
+
+# JSON.stringify writes half of a cut emoji as an escaped lone surrogate
+LONE_SURROGATE_JSON = '{"text": "Great post \\ud83d"}'
+
+
+def test_loads_accepts_lone_surrogate_escape():
+    assert _loads(LONE_SURROGATE_JSON) == json.loads(LONE_SURROGATE_JSON)
+
+
+def test_loads_plain_json():
+    assert _loads('{"posts": [1, 2]}') == {"posts": [1, 2]}
+
+
+def test_dumps_accepts_lone_surrogate():
+    payload = {"preview": "Great post \ud83d"}
+    assert json.loads(_dumps(payload)) == payload
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node not installed')
+def test_page_cap_keeps_surrogate_pairs_whole():
+    cap_js = re.search(r'const cap = \(s, n\) => \{.*?\n\s*\};', _SCRAPE_POST_JS, re.S).group(0)
+    script = cap_js + '''
+console.log(JSON.stringify([cap("ab\\u{1F600}cd", 3), cap("ab\\u{1F600}cd", 4), cap("abc", 5)]));'''
+    out = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == ['ab', 'ab\U0001F600', 'abc']